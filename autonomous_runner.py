@@ -1,6 +1,6 @@
 import schedule
 import time
-import dspy
+from src.llm import configure_lm
 from src.database import AuctionDatabase
 from src.analyzer import AuctionAnalyzer
 from src.report_generator import ReportGenerator
@@ -12,15 +12,6 @@ def run_analysis():
     print(f"AUTONOMOUS ANALYSIS TRIGGERED: {datetime.now()}")
     print(f"{'='*60}\n")
     
-    # Configure DSPy
-    ollama_model = dspy.LM(
-        model='ollama/llama3.1:8b',
-        api_base='http://localhost:11434',
-        api_key='ollama',
-        max_tokens=500
-    )
-    dspy.configure(lm=ollama_model)
-    
     # Run analysis
     db = AuctionDatabase()
     agent = AuctionAnalyzer(db)
@@ -33,6 +24,9 @@ def run_analysis():
     
     db.close()
 
+# Configure DSPy once so every run reuses the same LM session (model stays loaded)
+configure_lm(model='ollama/llama3.1:8b', max_tokens=500)
+
 # Schedule the job
 schedule.every().monday.at("09:00").do(run_analysis)
 
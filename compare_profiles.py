@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Compare latency vs. generated tokens of each inference profile per stage
+
+Generated tokens are the LM's completion tokens, so ChainOfThought's reasoning
+is counted, not just the final output field.
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+import dspy
+from src.analyzer import AuctionAnalyzer, INFERENCE_PROFILES
+from src.database import AuctionDatabase
+from src.llm import configure_lm
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare inference profiles")
+    parser.add_argument("--fiscal-year", type=int, default=2026)
+    parser.add_argument("--category", default="Heavy Equipment")
+    parser.add_argument("--compare-category", default="Trucks")
+    parser.add_argument("--runs", type=int, default=1, help="Runs per stage/profile (averaged)")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("INFERENCE PROFILE COMPARISON")
+    print("=" * 80)
+
+    # Cache off so every run actually hits the model
+    configure_lm(cache=False)
+
+    db = AuctionDatabase()
+    analyzer = AuctionAnalyzer(db)
+
+    # Downstream stages get fixed inputs (built once with the default profile)
+    # so their timing covers only their own LM call
+    print("Preparing inputs for downstream stages...")
+    fy_context = analyzer.fiscal_year_context(args.fiscal_year)
+    analysis1 = analyzer.analyze_single_category(args.category)
+    analysis2 = analyzer.analyze_single_category(args.compare_category)
+    trend_analysis = analyzer.analyze_weekly_lot_value_trends(args.fiscal_year, fy_context)
+    anomaly_analysis = analyzer.find_weekly_anomalies(args.fiscal_year, fy_context)
+
+    stages = {
+        "analyze_category": lambda: analyzer.analyze_single_category(args.category),
+        "compare_categories": lambda: analyzer.run_stage(
+            "compare_categories",
+            category1_analysis=f"{args.category}: {analysis1}",
+            category2_analysis=f"{args.compare_category}: {analysis2}"
+        ).comparison,
+        "analyze_trends": lambda: analyzer.analyze_weekly_lot_value_trends(args.fiscal_year, fy_context),
+        "identify_anomalies": lambda: analyzer.find_weekly_anomalies(args.fiscal_year, fy_context),
+        "generate_report": lambda: analyzer.run_stage(
+            "generate_report",
+            fy_context=fy_context,
+            trend_analysis=trend_analysis,
+            anomaly_analysis=anomaly_analysis
+        ).report,
+    }
+
+    results = []
+    for profile in INFERENCE_PROFILES:
+        analyzer.use_profile(profile)
+        for stage, run in stages.items():
+            latencies, tokens = [], []
+            for _ in range(args.runs):
+                history_start = len(dspy.settings.lm.history)
+                start = time.perf_counter()
+                run()
+                latencies.append(time.perf_counter() - start)
+                tokens.append(sum(
+                    (entry.get("usage") or {}).get("completion_tokens", 0)
+                    for entry in dspy.settings.lm.history[history_start:]
+                ))
+            results.append((
+                stage,
+                profile,
+                sum(latencies) / len(latencies),
+                sum(tokens) / len(tokens)
+            ))
+
+    print("\n" + "=" * 80)
+    print(f"{'Stage':<22}{'Profile':<12}{'Latency (s)':>14}{'Generated tokens':>18}")
+    print("-" * 80)
+    for stage, profile, latency, token_count in sorted(results):
+        print(f"{stage:<22}{profile:<12}{latency:>14.2f}{token_count:>18.0f}")
+    print("=" * 80)
+
+    # Keep the measurements next to the reports so profile defaults can cite them
+    os.makedirs("reports", exist_ok=True)
+    filepath = f"reports/profile_comparison_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(filepath, 'w') as f:
+        json.dump([
+            {"stage": stage, "profile": profile, "latency_s": latency, "completion_tokens": token_count}
+            for stage, profile, latency, token_count in sorted(results)
+        ], f, indent=2)
+    print(f"✓ Results saved to: {filepath}")
+
+    db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Check that the tables behind the analyzer have indexes for its access paths
+"""
+import argparse
+from src.database import AuctionDatabase
+
+def main():
+    parser = argparse.ArgumentParser(description="Index advisor for auction queries")
+    parser.add_argument("--create", action="store_true", help="Create missing indexes")
+    parser.add_argument("--analyze", action="store_true", help="Use EXPLAIN ANALYZE for real timings")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("INDEX ADVISOR")
+    print("=" * 80)
+
+    db = AuctionDatabase()
+    results = db.advise_indexes(create=args.create, analyze=args.analyze)
+
+    for r in results:
+        if r["problems"]:
+            status = "SLOW"
+        else:
+            status = "OK"
+
+        print(f"\n[{status}] {r['path']}")
+        print(f"   Plan: {' -> '.join(r['plan_nodes'])}")
+        print(f"   Total Cost: {r['total_cost']:,.2f}")
+        if r["execution_ms"] is not None:
+            print(f"   Execution: {r['execution_ms']:.3f} ms")
+
+        if r["created"]:
+            print(f"   ✓ Created {r['index']} ON {r['table']} {r['definition']}")
+        elif r["matching_index"]:
+            print(f"   Index: {r['matching_index']}")
+        else:
+            print(f"   Missing index: {r['index']} ON {r['table']} {r['definition']}")
+
+        if r["problems"] and r["matching_index"]:
+            print(f"   ⚠ {', '.join(sorted(set(r['problems'])))} despite index (table may be too small to prefer it)")
+        elif r["problems"]:
+            print(f"   ⚠ {', '.join(sorted(set(r['problems'])))}")
+
+    missing = {r["index"] for r in results if not r["matching_index"] and not r["created"]}
+    if missing:
+        print(f"\n{len(missing)} index(es) missing. Re-run with --create to add them (CONCURRENTLY).")
+
+    db.close()
+
+if __name__ == "__main__":
+    main()
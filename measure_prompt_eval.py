@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Measure Ollama prompt-evaluation (prefill) time per report, before and after
+the shared-prefix prompt layout
+
+Runs the weekly report once, recording each stage's signature and inputs,
+then formats the same calls two ways:
+  - before: plain ChatAdapter (per-signature system prompt first, shared
+    fiscal-year context inside each user message)
+  - after: SharedPrefixAdapter (static instructions + fiscal-year context
+    first, per-signature text and per-stage data after)
+Both layouts are replayed against Ollama's native API under the same warm
+conditions: model loaded, calls back to back, keep_alive on, and a reset
+prompt before each layout so neither starts with a cached prefix.
+"""
+import argparse
+import json
+import os
+import urllib.request
+from datetime import datetime
+import dspy
+from src.analyzer import AuctionAnalyzer
+from src.database import AuctionDatabase
+from src.llm import SharedPrefixAdapter, configure_lm
+
+class RecordingAdapter(SharedPrefixAdapter):
+    """SharedPrefixAdapter that keeps every call's signature, demos and inputs"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def format(self, signature, demos, inputs):
+        self.calls.append((signature, demos, dict(inputs)))
+        return super().format(signature, demos, inputs)
+
+def ollama_post(api_base: str, path: str, payload: dict) -> dict:
+    """POST JSON to the Ollama native API"""
+    request = urllib.request.Request(
+        f"{api_base}{path}",
+        data=json.dumps(payload).encode(),
+        headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+def prefill(api_base: str, model: str, messages: list) -> tuple:
+    """Evaluate a prompt (num_predict=1) and return Ollama's prompt_eval stats"""
+
+    response = ollama_post(api_base, "/api/chat", {
+        "model": model,
+        "messages": messages,
+        "stream": False,
+        "keep_alive": "30m",
+        "options": {"num_predict": 1, "temperature": 0}
+    })
+    return (
+        response.get("prompt_eval_count", 0),
+        response.get("prompt_eval_duration", 0) / 1e6
+    )
+
+def replay(api_base: str, model: str, prompts: list) -> list:
+    """Replay prompts back to back after a reset prompt that evicts any shared prefix"""
+
+    prefill(api_base, model, [{"role": "user", "content": "Reply with OK."}])
+    return [prefill(api_base, model, messages) for messages in prompts]
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure prompt-eval time per report")
+    parser.add_argument("--fiscal-year", type=int, default=2026)
+    parser.add_argument("--model", default="llama3.1:8b")
+    parser.add_argument("--api-base", default="http://localhost:11434")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("PROMPT EVALUATION (PREFILL): BEFORE vs AFTER SHARED PREFIX")
+    print("=" * 80)
+
+    configure_lm(model=f"ollama_chat/{args.model}", api_base=args.api_base, cache=False)
+    recorder = RecordingAdapter()
+
+    db = AuctionDatabase()
+    analyzer = AuctionAnalyzer(db, adapter=recorder)
+
+    # Capture each stage's inputs from one real report
+    analyzer.generate_full_weekly_report(args.fiscal_year)
+    db.close()
+
+    before_prompts = [dspy.ChatAdapter().format(*call) for call in recorder.calls]
+    after_prompts = [SharedPrefixAdapter().format(*call) for call in recorder.calls]
+
+    # Warm the model once so neither layout pays the load time
+    prefill(args.api_base, args.model, [{"role": "user", "content": "Reply with OK."}])
+
+    print(f"\nReplaying {len(recorder.calls)} calls per layout...")
+    before = replay(args.api_base, args.model, before_prompts)
+    after = replay(args.api_base, args.model, after_prompts)
+
+    print("\n" + "=" * 80)
+    print(f"{'Call':<6}{'Before tokens':>16}{'Before ms':>12}{'After tokens':>16}{'After ms':>12}")
+    print("-" * 80)
+    for i, ((before_tokens, before_ms), (after_tokens, after_ms)) in enumerate(zip(before, after), 1):
+        print(f"{i:<6}{before_tokens:>16}{before_ms:>12.1f}{after_tokens:>16}{after_ms:>12.1f}")
+    print("-" * 80)
+    print(
+        f"{'Total':<6}"
+        f"{sum(t for t, _ in before):>16}{sum(ms for _, ms in before):>12.1f}"
+        f"{sum(t for t, _ in after):>16}{sum(ms for _, ms in after):>12.1f}"
+    )
+    print("=" * 80)
+
+    # Keep the measurements next to the reports
+    os.makedirs("reports", exist_ok=True)
+    filepath = f"reports/prompt_eval_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(filepath, 'w') as f:
+        json.dump({
+            "model": args.model,
+            "fiscal_year": args.fiscal_year,
+            "before": [{"prompt_tokens": t, "prompt_eval_ms": ms} for t, ms in before],
+            "after": [{"prompt_tokens": t, "prompt_eval_ms": ms} for t, ms in after],
+        }, f, indent=2)
+    print(f"✓ Results saved to: {filepath}")
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,12 @@
 import dspy
+import json
 from src.database import AuctionDatabase
-from typing import Dict, List
+from src.llm import SharedPrefixAdapter
+from typing import Dict, List, Optional
+
+def _pct(value: Optional[float]) -> str:
+    """Format a precomputed percent change, or n/a when there is no baseline"""
+    return "n/a" if value is None else f"{value:+.1f}%"
 
 # DSPy Signatures (define what the LLM should do)
 
@@ -19,44 +25,175 @@ class CompareCategories(dspy.Signature):
     comparison = dspy.OutputField(desc="Comparative insights between categories")
 
 # NEW: Weekly Analysis Signatures
+#
+# Every weekly stage takes the same fy_context text, built once per report.
+# SharedPrefixAdapter (src/llm.py) moves it ahead of the per-signature system
+# prompt, so Ollama evaluates the shared prefix once and reuses its KV cache.
+# Per-stage data comes last.
+
+FY_CONTEXT_DESC = "Fiscal-year summary shared by every stage of the weekly report"
 
 class AnalyzeWeeklyTrends(dspy.Signature):
     """Analyze weekly auction trends and identify patterns."""
     
-    weekly_data = dspy.InputField(desc="Weekly metrics data including lot values, revenue, items sold")
-    summary_stats = dspy.InputField(desc="Overall statistics for the fiscal year")
+    fy_context = dspy.InputField(desc=FY_CONTEXT_DESC)
+    trend_summary = dspy.InputField(desc="Linear-fit slopes, latest rolling averages and % changes, top and bottom weeks")
+    weekly_data = dspy.InputField(desc="Per-week lot value with WoW/YoY % change and percentile")
     insights = dspy.OutputField(desc="Trend analysis, patterns, and key observations")
 
 class IdentifyAnomalies(dspy.Signature):
     """Identify unusual weeks or anomalies in auction performance."""
     
+    fy_context = dspy.InputField(desc=FY_CONTEXT_DESC)
     weekly_data = dspy.InputField(desc="Weekly metrics data")
-    avg_metrics = dspy.InputField(desc="Average metrics for comparison")
     anomalies = dspy.OutputField(desc="List of unusual weeks with explanations")
 
 class GenerateWeeklyReport(dspy.Signature):
     """Generate a comprehensive weekly performance report."""
     
+    fy_context = dspy.InputField(desc=FY_CONTEXT_DESC)
     trend_analysis = dspy.InputField(desc="Weekly trend analysis")
     anomaly_analysis = dspy.InputField(desc="Anomaly detection results")
-    summary_stats = dspy.InputField(desc="Overall statistics")
     report = dspy.OutputField(desc="Executive summary report with recommendations")
 
+# Inference Profiles (latency vs. depth per stage)
+
+STAGE_SIGNATURES = {
+    "analyze_category": AnalyzeCategory,
+    "compare_categories": CompareCategories,
+    "analyze_trends": AnalyzeWeeklyTrends,
+    "identify_anomalies": IdentifyAnomalies,
+    "generate_report": GenerateWeeklyReport,
+}
+
+# Each stage maps to (module type, max_tokens). ChainOfThought roughly doubles
+# generated tokens on a local 8B model, so only "thorough" uses it everywhere.
+# "thorough" keeps the original behavior (ChainOfThought, no per-stage cap) and
+# stays the default until compare_profiles.py numbers justify a lighter one.
+INFERENCE_PROFILES = {
+    "fast": {
+        "analyze_category": (dspy.Predict, 200),
+        "compare_categories": (dspy.Predict, 250),
+        "analyze_trends": (dspy.Predict, 300),
+        "identify_anomalies": (dspy.Predict, 250),
+        "generate_report": (dspy.Predict, 400),
+    },
+    "balanced": {
+        "analyze_category": (dspy.Predict, 300),
+        "compare_categories": (dspy.Predict, 400),
+        "analyze_trends": (dspy.ChainOfThought, 500),
+        "identify_anomalies": (dspy.Predict, 400),
+        "generate_report": (dspy.ChainOfThought, 600),
+    },
+    "thorough": {
+        "analyze_category": (dspy.ChainOfThought, None),
+        "compare_categories": (dspy.ChainOfThought, None),
+        "analyze_trends": (dspy.ChainOfThought, None),
+        "identify_anomalies": (dspy.ChainOfThought, None),
+        "generate_report": (dspy.ChainOfThought, None),
+    },
+}
+
+DEFAULT_PROFILE = "thorough"
+
 # DSPy Module (the agent)
 
 class AuctionAnalyzer(dspy.Module):
-    def __init__(self, db: AuctionDatabase):
+    def __init__(
+        self,
+        db: AuctionDatabase,
+        profile: Optional[str] = None,
+        stage_profiles: Optional[Dict[str, str]] = None,
+        compiled_paths: Optional[Dict[str, str]] = None,
+        adapter: Optional[dspy.Adapter] = None
+    ):
         super().__init__()
         self.db = db
         
-        # Category analysis
-        self.analyze_category = dspy.ChainOfThought(AnalyzeCategory)
-        self.compare_categories = dspy.ChainOfThought(CompareCategories)
+        # Every stage call runs through this adapter, whatever is configured globally
+        self.adapter = adapter or SharedPrefixAdapter()
+        
+        # Profile the caller asked for (None lets ReportGenerator pick per report)
+        self.requested_profile = profile
+        
+        # Compiled programs are saved per predictor layout, so keep one per profile.
+        # Stage overrides change that layout, so the two can't be combined.
+        if compiled_paths and stage_profiles:
+            raise ValueError(
+                "compiled_paths are saved per profile and can't be combined with stage_profiles"
+            )
+        self.compiled_paths = dict(compiled_paths or {})
+        
+        self.use_profile(profile or DEFAULT_PROFILE, stage_profiles)
+    
+    # ========== INFERENCE PROFILE METHODS ==========
+    
+    def use_profile(self, profile: str, stage_profiles: Optional[Dict[str, str]] = None):
+        """Rebuild stage predictors for a profile, with optional per-stage overrides"""
+        
+        stage_profiles = stage_profiles or {}
+        for name in [profile, *stage_profiles.values()]:
+            if name not in INFERENCE_PROFILES:
+                raise ValueError(
+                    f"Unknown inference profile '{name}'. "
+                    f"Choose from: {', '.join(INFERENCE_PROFILES)}"
+                )
         
-        # Weekly analysis
-        self.analyze_trends = dspy.ChainOfThought(AnalyzeWeeklyTrends)
-        self.identify_anomalies = dspy.ChainOfThought(IdentifyAnomalies)
-        self.generate_report = dspy.ChainOfThought(GenerateWeeklyReport)
+        unknown_stages = set(stage_profiles) - set(STAGE_SIGNATURES)
+        if unknown_stages:
+            raise ValueError(f"Unknown stages: {', '.join(sorted(unknown_stages))}")
+        
+        if stage_profiles and profile in self.compiled_paths:
+            raise ValueError(
+                f"Compiled program for profile '{profile}' can't be loaded with stage overrides"
+            )
+        
+        # Category analysis: analyze_category, compare_categories
+        # Weekly analysis: analyze_trends, identify_anomalies, generate_report
+        for stage, signature in STAGE_SIGNATURES.items():
+            module_type, max_tokens = INFERENCE_PROFILES[stage_profiles.get(stage, profile)][stage]
+            config = {"max_tokens": max_tokens} if max_tokens else {}
+            setattr(self, stage, module_type(signature, **config))
+        
+        self.profile = profile
+        self.stage_profiles = dict(stage_profiles)
+        
+        if profile in self.compiled_paths:
+            self.load_compiled(self.compiled_paths[profile])
+    
+    def load_compiled(self, path: str):
+        """Load an optimized/compiled program (demos, instructions) saved with dspy's save()
+        
+        The saved state must come from the same predictor layout: a
+        ChainOfThought stage is saved as `<stage>.predict`, a Predict stage
+        as `<stage>`.
+        """
+        
+        expected = sorted(name for name, _ in self.named_predictors())
+        
+        if path.endswith(".json"):
+            with open(path) as f:
+                saved = sorted(key for key in json.load(f) if key != "metadata")
+            if saved != expected:
+                raise ValueError(
+                    f"Compiled program {path} does not match the current predictor layout "
+                    f"(profile '{self.profile}', overrides {self.stage_profiles}). "
+                    f"Saved: {saved}; expected: {expected}"
+                )
+        
+        try:
+            self.load(path)
+        except KeyError as e:
+            raise ValueError(
+                f"Compiled program {path} does not match the current predictor layout "
+                f"(profile '{self.profile}'): missing {e}"
+            ) from e
+    
+    def run_stage(self, stage: str, **inputs) -> dspy.Prediction:
+        """Call a stage predictor with the analyzer's prompt-layout adapter"""
+        
+        with dspy.context(adapter=self.adapter):
+            return getattr(self, stage)(**inputs)
     
     # ========== EXISTING CATEGORY METHODS ==========
     
@@ -82,7 +219,8 @@ Total Fees: ${stats['total_fees']:,.2f}
         ])
         
         # Step 2: Agent analyzes autonomously
-        result = self.analyze_category(
+        result = self.run_stage(
+            "analyze_category",
             category_stats=stats_text,
             sample_items=items_text
         )
@@ -97,7 +235,8 @@ Total Fees: ${stats['total_fees']:,.2f}
         analysis2 = self.analyze_single_category(cat2)
         
         # Step 2: Agent compares autonomously
-        result = self.compare_categories(
+        result = self.run_stage(
+            "compare_categories",
             category1_analysis=f"{cat1}: {analysis1}",
             category2_analysis=f"{cat2}: {analysis2}"
         )
@@ -119,52 +258,84 @@ Total Fees: ${stats['total_fees']:,.2f}
     
     # ========== NEW WEEKLY ANALYSIS METHODS ==========
     
-    def analyze_weekly_lot_value_trends(self, fiscal_year: int = 2026) -> str:
-        """Autonomously analyze weekly average lot value trends"""
+    def fiscal_year_context(self, fiscal_year: int = 2026) -> str:
+        """Build the shared fiscal-year summary that prefixes every weekly stage"""
         
-        print(f"Analyzing weekly trends for FY{fiscal_year}...")
-        
-        # Step 1: Get weekly data
-        weekly_data = self.db.get_weekly_metrics(fiscal_year=fiscal_year)
         summary_stats = self.db.get_weekly_stats_summary(fiscal_year=fiscal_year)
         
-        # Step 2: Format for LLM
-        weekly_text = "\n".join([
-            f"Week {w['fiscal_week_number']} ({w['week_start_date']} to {w['week_end_date']}): "
-            f"Avg Lot Value: ${w['avg_lot_value']:,}, "
-            f"Items: {w['total_items_sold']}, "
-            f"Revenue: ${w['total_revenue']:,}, "
-            f"Bids: {w['total_bids']}"
-            for w in weekly_data
-        ])
-        
-        summary_text = f"""
+        return f"""
 Fiscal Year {fiscal_year} Summary:
 Total Weeks: {summary_stats['total_weeks']}
 Overall Avg Lot Value: ${summary_stats['avg_lot_value_overall']:,.2f}
 Min Weekly Avg: ${summary_stats['min_weekly_lot_value']:,}
 Max Weekly Avg: ${summary_stats['max_weekly_lot_value']:,}
+Avg Items per Week: {summary_stats['total_items_fy'] / summary_stats['total_weeks']:.0f}
 Total Revenue: ${summary_stats['total_revenue_fy']:,}
 Total Items Sold: {summary_stats['total_items_fy']}
 Total Bids: {summary_stats['total_bids_fy']}
 """
+    
+    def analyze_weekly_lot_value_trends(self, fiscal_year: int = 2026, fy_context: Optional[str] = None) -> str:
+        """Autonomously analyze weekly average lot value trends"""
+        
+        print(f"Analyzing weekly trends for FY{fiscal_year}...")
+        
+        # Step 1: Get precomputed trend features and shared context
+        features = self.db.get_weekly_trend_features(fiscal_year=fiscal_year)
+        fy_context = fy_context or self.fiscal_year_context(fiscal_year)
+        
+        # Step 2: Format compact features for LLM. Per-week lines carry only
+        # the headline values; everything else is summarized once.
+        if features:
+            latest = features[-1]
+            by_rank = sorted(features, key=lambda f: f['lot_value_rank'])
+            top_weeks = ", ".join(f"Wk {f['fiscal_week_number']}" for f in by_rank[:3])
+            bottom_weeks = ", ".join(f"Wk {f['fiscal_week_number']}" for f in by_rank[-3:])
+            slope_text = (
+                f"Lot Value Trend (linear fit): ${latest['lot_value_slope']:+,.2f}/week\n"
+                f"Revenue Trend (linear fit): ${latest['revenue_slope']:+,.2f}/week\n"
+                if latest['lot_value_slope'] is not None and latest['revenue_slope'] is not None
+                else "Linear Trend: n/a (not enough weeks)\n"
+            )
+            summary_text = (
+                slope_text
+                + f"Latest Lot Value Avg: 4wk ${latest['lot_value_avg_4wk']:,.0f}, 13wk ${latest['lot_value_avg_13wk']:,.0f}\n"
+                f"Latest Revenue Avg: 4wk ${latest['revenue_avg_4wk']:,.0f}, 13wk ${latest['revenue_avg_13wk']:,.0f}\n"
+                f"Latest Week (Wk {latest['fiscal_week_number']}): "
+                f"Revenue WoW {_pct(latest['revenue_wow_pct'])}, YoY {_pct(latest['revenue_yoy_pct'])}; "
+                f"Items WoW {_pct(latest['items_wow_pct'])}, YoY {_pct(latest['items_yoy_pct'])}; "
+                f"Bids WoW {_pct(latest['bids_wow_pct'])}, YoY {_pct(latest['bids_yoy_pct'])}\n"
+                f"Top Lot Value Weeks: {top_weeks}\n"
+                f"Bottom Lot Value Weeks: {bottom_weeks}"
+            )
+        else:
+            summary_text = "No weekly data"
+        
+        weekly_text = "\n".join([
+            f"Wk {f['fiscal_week_number']}: ${f['avg_lot_value']:,.0f} "
+            f"WoW {_pct(f['lot_value_wow_pct'])} YoY {_pct(f['lot_value_yoy_pct'])} "
+            f"p{f['lot_value_percentile']}"
+            for f in features
+        ])
         
         # Step 3: Agent analyzes trends
-        result = self.analyze_trends(
-            weekly_data=weekly_text,
-            summary_stats=summary_text
+        result = self.run_stage(
+            "analyze_trends",
+            fy_context=fy_context,
+            trend_summary=summary_text,
+            weekly_data=weekly_text
         )
         
         return result.insights
     
-    def find_weekly_anomalies(self, fiscal_year: int = 2026) -> str:
+    def find_weekly_anomalies(self, fiscal_year: int = 2026, fy_context: Optional[str] = None) -> str:
         """Autonomously identify unusual weeks"""
         
         print(f"Identifying anomalies for FY{fiscal_year}...")
         
         # Step 1: Get data
         weekly_data = self.db.get_weekly_metrics(fiscal_year=fiscal_year)
-        summary_stats = self.db.get_weekly_stats_summary(fiscal_year=fiscal_year)
+        fy_context = fy_context or self.fiscal_year_context(fiscal_year)
         
         # Step 2: Format for LLM
         weekly_text = "\n".join([
@@ -173,16 +344,11 @@ Total Bids: {summary_stats['total_bids_fy']}
             for w in weekly_data
         ])
         
-        avg_text = f"""
-Average Metrics (for comparison):
-Avg Lot Value: ${summary_stats['avg_lot_value_overall']:,.2f}
-Avg Items per Week: {summary_stats['total_items_fy'] / summary_stats['total_weeks']:.0f}
-"""
-        
         # Step 3: Agent identifies anomalies
-        result = self.identify_anomalies(
-            weekly_data=weekly_text,
-            avg_metrics=avg_text
+        result = self.run_stage(
+            "identify_anomalies",
+            fy_context=fy_context,
+            weekly_data=weekly_text
         )
         
         return result.anomalies
@@ -192,25 +358,19 @@ Avg Items per Week: {summary_stats['total_items_fy'] / summary_stats['total_week
         
         print(f"Generating full report for FY{fiscal_year}...")
         
-        # Step 1: Get all analyses
-        trend_analysis = self.analyze_weekly_lot_value_trends(fiscal_year)
-        anomaly_analysis = self.find_weekly_anomalies(fiscal_year)
-        summary_stats = self.db.get_weekly_stats_summary(fiscal_year)
-        
-        # Step 2: Format summary stats
-        summary_text = f"""
-FY{fiscal_year} Performance:
-- {summary_stats['total_weeks']} weeks of data
-- ${summary_stats['total_revenue_fy']:,} total revenue
-- {summary_stats['total_items_fy']} items sold
-- ${summary_stats['avg_lot_value_overall']:,.2f} average lot value
-"""
+        # Step 1: Build the shared context once so every stage sends the same prefix
+        fy_context = self.fiscal_year_context(fiscal_year)
+        
+        # Step 2: Get all analyses
+        trend_analysis = self.analyze_weekly_lot_value_trends(fiscal_year, fy_context)
+        anomaly_analysis = self.find_weekly_anomalies(fiscal_year, fy_context)
         
         # Step 3: Agent generates executive report
-        result = self.generate_report(
+        result = self.run_stage(
+            "generate_report",
+            fy_context=fy_context,
             trend_analysis=trend_analysis,
-            anomaly_analysis=anomaly_analysis,
-            summary_stats=summary_text
+            anomaly_analysis=anomaly_analysis
         )
         
-        return result.report
\ No newline at end of file
+        return result.report
@@ -1,6 +1,122 @@
 import psycopg2
 from psycopg2.extras import RealDictCursor
-from typing import List, Dict, Optional
+from datetime import date
+from typing import List, Dict, Optional, Tuple
+
+ITEM_COLUMNS = (
+    "unique_id", "model", "category", "auctiondate",
+    "hammer", "contract_price", "total_fees"
+)
+
+# Composite indexes backing the analyzer's access paths:
+# name -> (table, key columns, definition). An existing index whose leading key
+# columns match counts as present whatever it is named. The INCLUDE columns let
+# get_category_stats and get_all_categories run as index-only scans.
+RECOMMENDED_INDEXES = {
+    "idx_itemsbasics_category_auctiondate": (
+        "itemsbasics",
+        ["category", "auctiondate", "unique_id"],
+        "(category, auctiondate DESC NULLS LAST, unique_id DESC) INCLUDE (hammer, total_fees)"
+    ),
+    "idx_weekly_metrics_fiscal_year_week": (
+        "weekly_metrics",
+        ["fiscal_year", "week_start_date"],
+        "(fiscal_year, week_start_date)"
+    ),
+}
+
+CATEGORY_STATS_QUERY = """
+    SELECT 
+        category,
+        COUNT(*) as count,
+        AVG(hammer) as avg_price,
+        MIN(hammer) as min_price,
+        MAX(hammer) as max_price,
+        SUM(total_fees) as total_fees
+    FROM itemsbasics
+    WHERE category = %s
+    GROUP BY category
+"""
+
+ALL_CATEGORIES_QUERY = "SELECT DISTINCT category FROM itemsbasics WHERE category IS NOT NULL"
+
+WEEKLY_STATS_SUMMARY_QUERY = """
+    SELECT 
+        COUNT(*) as total_weeks,
+        AVG(avg_lot_value) as avg_lot_value_overall,
+        MIN(avg_lot_value) as min_weekly_lot_value,
+        MAX(avg_lot_value) as max_weekly_lot_value,
+        SUM(total_revenue) as total_revenue_fy,
+        SUM(total_fees) as total_fees_fy,
+        SUM(total_items_sold) as total_items_fy,
+        SUM(total_bids) as total_bids_fy
+    FROM weekly_metrics
+    WHERE fiscal_year = %s
+"""
+
+# Prior fiscal year is scanned too so week 1 has rolling history and every
+# week has a year-over-year comparison point.
+WEEKLY_TREND_FEATURES_QUERY = """
+    WITH base AS (
+        SELECT
+            fiscal_week_number, fiscal_year,
+            week_start_date, week_end_date,
+            total_items_sold, avg_lot_value,
+            total_revenue, total_bids,
+            AVG(avg_lot_value) OVER (
+                ORDER BY week_start_date
+                ROWS BETWEEN 3 PRECEDING AND CURRENT ROW
+            ) as lot_value_avg_4wk,
+            AVG(avg_lot_value) OVER (
+                ORDER BY week_start_date
+                ROWS BETWEEN 12 PRECEDING AND CURRENT ROW
+            ) as lot_value_avg_13wk,
+            AVG(total_revenue) OVER (
+                ORDER BY week_start_date
+                ROWS BETWEEN 3 PRECEDING AND CURRENT ROW
+            ) as revenue_avg_4wk,
+            AVG(total_revenue) OVER (
+                ORDER BY week_start_date
+                ROWS BETWEEN 12 PRECEDING AND CURRENT ROW
+            ) as revenue_avg_13wk,
+            LAG(avg_lot_value) OVER w_prev as prev_lot_value,
+            LAG(total_revenue) OVER w_prev as prev_revenue,
+            LAG(total_items_sold) OVER w_prev as prev_items,
+            LAG(total_bids) OVER w_prev as prev_bids,
+            LAG(avg_lot_value) OVER w_ly as ly_lot_value,
+            LAG(total_revenue) OVER w_ly as ly_revenue,
+            LAG(total_items_sold) OVER w_ly as ly_items,
+            LAG(total_bids) OVER w_ly as ly_bids
+        FROM weekly_metrics
+        WHERE fiscal_year BETWEEN %s - 1 AND %s
+        WINDOW
+            w_prev AS (ORDER BY week_start_date),
+            w_ly AS (PARTITION BY fiscal_week_number ORDER BY fiscal_year)
+    )
+    SELECT
+        fiscal_week_number, fiscal_year,
+        week_start_date, week_end_date,
+        total_items_sold, avg_lot_value,
+        total_revenue, total_bids,
+        lot_value_avg_4wk, lot_value_avg_13wk,
+        revenue_avg_4wk, revenue_avg_13wk,
+        ROUND((100.0 * (avg_lot_value - prev_lot_value) / NULLIF(prev_lot_value, 0))::numeric, 1) as lot_value_wow_pct,
+        ROUND((100.0 * (total_revenue - prev_revenue) / NULLIF(prev_revenue, 0))::numeric, 1) as revenue_wow_pct,
+        ROUND((100.0 * (total_items_sold - prev_items) / NULLIF(prev_items, 0))::numeric, 1) as items_wow_pct,
+        ROUND((100.0 * (total_bids - prev_bids) / NULLIF(prev_bids, 0))::numeric, 1) as bids_wow_pct,
+        ROUND((100.0 * (avg_lot_value - ly_lot_value) / NULLIF(ly_lot_value, 0))::numeric, 1) as lot_value_yoy_pct,
+        ROUND((100.0 * (total_revenue - ly_revenue) / NULLIF(ly_revenue, 0))::numeric, 1) as revenue_yoy_pct,
+        ROUND((100.0 * (total_items_sold - ly_items) / NULLIF(ly_items, 0))::numeric, 1) as items_yoy_pct,
+        ROUND((100.0 * (total_bids - ly_bids) / NULLIF(ly_bids, 0))::numeric, 1) as bids_yoy_pct,
+        RANK() OVER (ORDER BY avg_lot_value DESC) as lot_value_rank,
+        ROUND((100 * PERCENT_RANK() OVER (ORDER BY avg_lot_value))::numeric, 0) as lot_value_percentile,
+        RANK() OVER (ORDER BY total_revenue DESC) as revenue_rank,
+        REGR_SLOPE(avg_lot_value, fiscal_week_number) OVER () as lot_value_slope,
+        REGR_SLOPE(total_revenue, fiscal_week_number) OVER () as revenue_slope
+    FROM base
+    WHERE fiscal_year = %s
+    ORDER BY week_start_date
+"""
 
 class AuctionDatabase:
     def __init__(self):
@@ -19,20 +135,109 @@ class AuctionDatabase:
         max_price: Optional[float] = None,
         limit: int = 20
     ) -> List[Dict]:
-        """Query auction items with filters"""
+        """Query auction items with filters, newest first
         
-        query = """
-            SELECT 
-                unique_id, model, category, auctiondate,
-                hammer, contract_price, total_fees
+        Items without an auctiondate are included and listed last.
+        """
+        
+        query, params = self._build_items_query(
+            categories=[category] if category else None,
+            min_price=min_price,
+            max_price=max_price,
+            limit=limit,
+            dated_only=False
+        )
+        
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(query, params)
+            return cur.fetchall()
+    
+    def query_items(
+        self,
+        categories: Optional[List[str]] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        columns: Optional[List[str]] = None,
+        after: Optional[Tuple] = None,
+        limit: int = 20
+    ) -> Tuple[List[Dict], Optional[Tuple]]:
+        """Query auction items newest-first with keyset pagination
+        
+        Pass the returned cursor as `after` to fetch the next page; it is
+        None once there are no more rows. Items without an auctiondate can't
+        be keyed, so they are excluded here (get_items still returns them).
+        """
+        
+        # One extra row tells us whether another page exists
+        query, params = self._build_items_query(
+            categories, start_date, end_date, min_price, max_price, columns, after, limit + 1
+        )
+        
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(query, params)
+            items = cur.fetchall()
+        
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            last = items[-1]
+            next_cursor = (last["auctiondate"], last["unique_id"])
+        
+        return items, next_cursor
+    
+    @staticmethod
+    def _build_items_query(
+        categories: Optional[List[str]] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        columns: Optional[List[str]] = None,
+        after: Optional[Tuple] = None,
+        limit: int = 20,
+        dated_only: bool = True
+    ) -> Tuple[str, List]:
+        """Build the SQL and params for query_items / get_items"""
+        
+        columns = list(columns or ITEM_COLUMNS)
+        unknown = set(columns) - set(ITEM_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown item columns: {', '.join(sorted(unknown))}")
+        
+        # Cursor columns are always projected so the next page can be keyed
+        for key in ("auctiondate", "unique_id"):
+            if key not in columns:
+                columns.append(key)
+        
+        query = f"""
+            SELECT {", ".join(columns)}
             FROM itemsbasics
             WHERE 1=1
         """
         params = []
         
-        if category:
+        # NULL dates can't be compared against the keyset cursor
+        if dated_only:
+            query += " AND auctiondate IS NOT NULL"
+        
+        # Plain equality for one category lets the (category, auctiondate DESC)
+        # index return rows in order and stop at the LIMIT; ANY() does not
+        if categories and len(categories) == 1:
             query += " AND category = %s"
-            params.append(category)
+            params.append(categories[0])
+        elif categories:
+            query += " AND category = ANY(%s)"
+            params.append(list(categories))
+        
+        if start_date is not None:
+            query += " AND auctiondate >= %s"
+            params.append(start_date)
+        
+        if end_date is not None:
+            query += " AND auctiondate <= %s"
+            params.append(end_date)
         
         if min_price is not None:
             query += " AND hammer >= %s"
@@ -42,40 +247,27 @@ class AuctionDatabase:
             query += " AND hammer <= %s"
             params.append(max_price)
         
-        query += " ORDER BY auctiondate DESC LIMIT %s"
+        if after is not None:
+            query += " AND (auctiondate, unique_id) < (%s, %s)"
+            params.extend(after)
+        
+        query += " ORDER BY auctiondate DESC NULLS LAST, unique_id DESC LIMIT %s"
         params.append(limit)
         
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(query, params)
-            return cur.fetchall()
+        return query, params
     
     def get_category_stats(self, category: str) -> Dict:
         """Get statistics for a category"""
         
-        query = """
-            SELECT 
-                category,
-                COUNT(*) as count,
-                AVG(hammer) as avg_price,
-                MIN(hammer) as min_price,
-                MAX(hammer) as max_price,
-                SUM(total_fees) as total_fees
-            FROM itemsbasics
-            WHERE category = %s
-            GROUP BY category
-        """
-        
         with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(query, [category])
+            cur.execute(CATEGORY_STATS_QUERY, [category])
             return cur.fetchone()
     
     def get_all_categories(self) -> List[str]:
         """Get list of all categories"""
         
-        query = "SELECT DISTINCT category FROM itemsbasics WHERE category IS NOT NULL"
-        
         with self.conn.cursor() as cur:
-            cur.execute(query)
+            cur.execute(ALL_CATEGORIES_QUERY)
             return [row[0] for row in cur.fetchall()]
     
     # NEW: Weekly Metrics Methods
@@ -89,6 +281,21 @@ class AuctionDatabase:
     ) -> List[Dict]:
         """Query weekly metrics with optional filters"""
         
+        query, params = self._build_weekly_metrics_query(fiscal_year, start_week, end_week, limit)
+        
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(query, params)
+            return cur.fetchall()
+    
+    @staticmethod
+    def _build_weekly_metrics_query(
+        fiscal_year: Optional[int] = None,
+        start_week: Optional[int] = None,
+        end_week: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[str, List]:
+        """Build the SQL and params for get_weekly_metrics"""
+        
         query = """
             SELECT 
                 fiscal_week_number, fiscal_year,
@@ -118,31 +325,155 @@ class AuctionDatabase:
             query += " LIMIT %s"
             params.append(limit)
         
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(query, params)
-            return cur.fetchall()
+        return query, params
     
     def get_weekly_stats_summary(self, fiscal_year: int = 2026) -> Dict:
         """Get summary statistics for weekly metrics"""
         
-        query = """
-            SELECT 
-                COUNT(*) as total_weeks,
-                AVG(avg_lot_value) as avg_lot_value_overall,
-                MIN(avg_lot_value) as min_weekly_lot_value,
-                MAX(avg_lot_value) as max_weekly_lot_value,
-                SUM(total_revenue) as total_revenue_fy,
-                SUM(total_fees) as total_fees_fy,
-                SUM(total_items_sold) as total_items_fy,
-                SUM(total_bids) as total_bids_fy
-            FROM weekly_metrics
-            WHERE fiscal_year = %s
-        """
-        
         with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(query, [fiscal_year])
+            cur.execute(WEEKLY_STATS_SUMMARY_QUERY, [fiscal_year])
             return cur.fetchone()
-    
+
+    def get_weekly_trend_features(self, fiscal_year: int = 2026) -> List[Dict]:
+        """Compute per-week trend features with window functions in one pass"""
+
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(WEEKLY_TREND_FEATURES_QUERY, [fiscal_year, fiscal_year, fiscal_year])
+            return cur.fetchall()
+
+    # Index Advisor
+
+    def advise_indexes(self, create: bool = False, analyze: bool = False) -> List[Dict]:
+        """EXPLAIN the analyzer's queries and report (or create) the indexes they need
+
+        A path is flagged when its plan sequentially scans the table or, for
+        ordered paths, sorts instead of reading an index in order.
+        """
+
+        created = []
+        if create:
+            created = self._create_missing_indexes()
+
+        with self.conn.cursor() as cur:
+            cur.execute(ALL_CATEGORIES_QUERY + " LIMIT 1")
+            row = cur.fetchone()
+        sample_category = row[0] if row else ""
+        fiscal_year = date.today().year
+
+        # (access path, index it relies on, query, params, must avoid Sort)
+        items_query, items_params = self._build_items_query(
+            categories=[sample_category], limit=5, dated_only=False
+        )
+        weekly_query, weekly_params = self._build_weekly_metrics_query(fiscal_year=fiscal_year)
+        access_paths = [
+            ("get_items", "idx_itemsbasics_category_auctiondate", items_query, items_params, True),
+            ("get_category_stats", "idx_itemsbasics_category_auctiondate", CATEGORY_STATS_QUERY, [sample_category], False),
+            ("get_all_categories", "idx_itemsbasics_category_auctiondate", ALL_CATEGORIES_QUERY, [], False),
+            ("get_weekly_metrics", "idx_weekly_metrics_fiscal_year_week", weekly_query, weekly_params, True),
+            ("get_weekly_stats_summary", "idx_weekly_metrics_fiscal_year_week", WEEKLY_STATS_SUMMARY_QUERY, [fiscal_year], False),
+            # Window functions always sort; only the fiscal-year range scan is checked
+            ("get_weekly_trend_features", "idx_weekly_metrics_fiscal_year_week", WEEKLY_TREND_FEATURES_QUERY, [fiscal_year] * 3, False),
+        ]
+
+        explain = "EXPLAIN (ANALYZE, FORMAT JSON) " if analyze else "EXPLAIN (FORMAT JSON) "
+        results = []
+        for path, index, query, params, ordered in access_paths:
+            table, key_columns, definition = RECOMMENDED_INDEXES[index]
+
+            with self.conn.cursor() as cur:
+                cur.execute(explain + query, params)
+                plan = cur.fetchone()[0][0]
+
+            plan_nodes = self._plan_nodes(plan["Plan"])
+            problems = [node for node in plan_nodes if node == f"Seq Scan on {table}"]
+            if ordered:
+                problems += [node for node in plan_nodes if node == "Sort"]
+
+            results.append({
+                "path": path,
+                "index": index,
+                "table": table,
+                "definition": definition,
+                "matching_index": self._find_matching_index(table, key_columns),
+                "created": index in created,
+                "plan_nodes": plan_nodes,
+                "problems": problems,
+                "total_cost": plan["Plan"]["Total Cost"],
+                "execution_ms": plan.get("Execution Time"),
+            })
+
+        # EXPLAIN ANALYZE runs inside the read transaction; don't leave it open
+        self.conn.rollback()
+        return results
+
+    def _find_matching_index(self, table: str, key_columns: List[str]) -> Optional[str]:
+        """Name of an index on table whose leading key columns are key_columns"""
+
+        query = """
+            SELECT ic.relname,
+                ARRAY(
+                    SELECT a.attname
+                    FROM unnest(ix.indkey::int2[]) WITH ORDINALITY AS k(attnum, ord)
+                    JOIN pg_attribute a
+                        ON a.attrelid = ix.indrelid AND a.attnum = k.attnum
+                    WHERE k.ord <= ix.indnkeyatts
+                    ORDER BY k.ord
+                ) as key_columns
+            FROM pg_index ix
+            JOIN pg_class ic ON ic.oid = ix.indexrelid
+            WHERE ix.indrelid = %s::regclass AND ix.indisvalid
+        """
+
+        with self.conn.cursor() as cur:
+            cur.execute(query, [table])
+            for name, columns in cur.fetchall():
+                if columns[:len(key_columns)] == key_columns:
+                    return name
+        return None
+
+    def _create_missing_indexes(self) -> List[str]:
+        """Create recommended indexes that have no equivalent, without locking writes
+
+        Returns only the indexes that are valid and matching afterwards.
+        """
+
+        missing = [
+            (name, table, key_columns, definition)
+            for name, (table, key_columns, definition) in RECOMMENDED_INDEXES.items()
+            if self._find_matching_index(table, key_columns) is None
+        ]
+
+        # CREATE INDEX CONCURRENTLY can't run inside a transaction block
+        self.conn.rollback()
+        self.conn.autocommit = True
+        try:
+            with self.conn.cursor() as cur:
+                for name, table, _, definition in missing:
+                    # A failed CONCURRENTLY build leaves an invalid index behind,
+                    # which would make IF NOT EXISTS silently skip the rebuild
+                    cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+                    cur.execute(f"CREATE INDEX CONCURRENTLY {name} ON {table} {definition}")
+                    cur.execute(f"ANALYZE {table}")
+        finally:
+            self.conn.autocommit = False
+
+        return [
+            name for name, table, key_columns, _ in missing
+            if self._find_matching_index(table, key_columns) == name
+        ]
+
+    def _plan_nodes(self, node: Dict) -> List[str]:
+        """Flatten an EXPLAIN JSON plan into 'Node Type [on relation]' strings"""
+
+        label = node["Node Type"]
+        if "Relation Name" in node:
+            label += f" on {node['Relation Name']}"
+
+        nodes = [label]
+        for child in node.get("Plans", []):
+            nodes.extend(self._plan_nodes(child))
+        return nodes
+
     def close(self):
         """Close database connection"""
         self.conn.close()
\ No newline at end of file
@@ -0,0 +1,69 @@
+import dspy
+
+# Static text that opens every prompt, before any per-signature instructions
+SHARED_INSTRUCTIONS = (
+    "You are an analyst for Purple Wave auction data. "
+    "Base every statement on the figures provided and keep answers concise."
+)
+
+class SharedPrefixAdapter(dspy.ChatAdapter):
+    """ChatAdapter that puts static instructions and shared context first
+
+    ChatAdapter opens every call with a system prompt derived from the
+    signature, so two stages diverge after a few tokens even when they share
+    inputs. This adapter moves the shared input fields (e.g. fy_context) into
+    a system-message prefix ahead of the per-signature text, giving every call
+    in a report the same prompt prefix for Ollama's KV cache to reuse.
+
+    Demos (e.g. from a compiled program) are formatted without the shared
+    fields, which is lossless only when they carry the same shared values as
+    the current call. Otherwise the call falls back to the plain ChatAdapter
+    layout so each demo keeps its own context.
+
+    When parsing fails, ChatAdapter retries through JSONAdapter, which uses
+    its own layout. That retry is still correct but pays full prefill.
+    """
+
+    def __init__(self, shared_fields=("fy_context",), **kwargs):
+        super().__init__(**kwargs)
+        self.shared_fields = tuple(shared_fields)
+
+    def format(self, signature, demos, inputs):
+        shared = [name for name in self.shared_fields if name in signature.input_fields]
+
+        if any(
+            name in demo and demo[name] != inputs[name]
+            for demo in demos for name in shared
+        ):
+            return super().format(signature, demos, inputs)
+
+        prefix = SHARED_INSTRUCTIONS
+        for name in shared:
+            desc = signature.input_fields[name].json_schema_extra["desc"]
+            prefix += f"\n\n{desc}:\n{inputs[name]}"
+            signature = signature.delete(name)
+
+        messages = super().format(
+            signature,
+            demos,
+            {key: value for key, value in inputs.items() if key not in shared}
+        )
+        messages[0] = {"role": "system", "content": f"{prefix}\n\n{messages[0]['content']}"}
+        return messages
+
+def configure_lm(
+    model: str = "ollama_chat/llama3.1:8b",
+    api_base: str = "http://localhost:11434",
+    keep_alive: str = "30m",
+    **kwargs
+) -> dspy.LM:
+    """Configure one shared Ollama LM for every stage
+
+    keep_alive holds the model (and its KV cache) in memory between calls, so
+    the prefix AuctionAnalyzer's SharedPrefixAdapter keeps identical is reused
+    instead of re-running prefill.
+    """
+
+    lm = dspy.LM(model, api_base=api_base, api_key="", keep_alive=keep_alive, **kwargs)
+    dspy.configure(lm=lm)
+    return lm
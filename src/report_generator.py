@@ -1,18 +1,42 @@
 from datetime import datetime
 from src.analyzer import AuctionAnalyzer
 from src.database import AuctionDatabase
+from typing import Dict, Optional
 import json
 
+# Default inference profile per report type, used only when neither the call
+# nor the AuctionAnalyzer sets one. All "thorough" (the original behavior)
+# until compare_profiles.py measurements support a lighter profile.
+REPORT_PROFILES = {
+    "category_auction_analysis": "thorough",
+    "weekly_trends_analysis": "thorough",
+    "comprehensive_executive_report": "thorough",
+}
+
 class ReportGenerator:
-    def __init__(self, agent: AuctionAnalyzer):
+    def __init__(self, agent: AuctionAnalyzer, report_profiles: Optional[Dict[str, str]] = None):
         self.agent = agent
+        self.report_profiles = {**REPORT_PROFILES, **(report_profiles or {})}
     
-    def generate_category_report(self) -> dict:
+    def _use_report_profile(self, report_type: str, profile: Optional[str] = None) -> str:
+        """Switch the agent to the inference profile for a report type
+        
+        Precedence: the call's profile, then the profile the agent was built
+        with, then report_profiles. The agent's stage overrides are kept.
+        """
+        
+        profile = profile or self.agent.requested_profile or self.report_profiles[report_type]
+        if profile != self.agent.profile:
+            self.agent.use_profile(profile, self.agent.stage_profiles)
+        return profile
+    
+    def generate_category_report(self, profile: Optional[str] = None) -> dict:
         """Generate comprehensive category-based auction report"""
         
         report = {
             "generated_at": datetime.now().isoformat(),
             "report_type": "category_auction_analysis",
+            "inference_profile": self._use_report_profile("category_auction_analysis", profile),
             "analyses": {}
         }
         
@@ -38,24 +62,28 @@ class ReportGenerator:
         
         return report
     
-    def generate_weekly_trends_report(self, fiscal_year: int = 2026) -> dict:
+    def generate_weekly_trends_report(self, fiscal_year: int = 2026, profile: Optional[str] = None) -> dict:
         """Generate weekly trend analysis report"""
         
         report = {
             "generated_at": datetime.now().isoformat(),
             "report_type": "weekly_trends_analysis",
+            "inference_profile": self._use_report_profile("weekly_trends_analysis", profile),
             "fiscal_year": fiscal_year,
         }
         
         print(f"Generating weekly trends report for FY{fiscal_year}...")
         
+        # Shared context keeps the prompt prefix identical across both stages
+        fy_context = self.agent.fiscal_year_context(fiscal_year)
+        
         # Get trend analysis
         print("  Analyzing trends...")
-        report["trend_analysis"] = self.agent.analyze_weekly_lot_value_trends(fiscal_year)
+        report["trend_analysis"] = self.agent.analyze_weekly_lot_value_trends(fiscal_year, fy_context)
         
         # Get anomalies
         print("  Identifying anomalies...")
-        report["anomalies"] = self.agent.find_weekly_anomalies(fiscal_year)
+        report["anomalies"] = self.agent.find_weekly_anomalies(fiscal_year, fy_context)
         
         # Get summary stats
         summary_stats = self.agent.db.get_weekly_stats_summary(fiscal_year)
@@ -69,12 +97,13 @@ class ReportGenerator:
         
         return report
     
-    def generate_comprehensive_report(self, fiscal_year: int = 2026) -> dict:
+    def generate_comprehensive_report(self, fiscal_year: int = 2026, profile: Optional[str] = None) -> dict:
         """Generate full executive report with trends, anomalies, and recommendations"""
         
         report = {
             "generated_at": datetime.now().isoformat(),
             "report_type": "comprehensive_executive_report",
+            "inference_profile": self._use_report_profile("comprehensive_executive_report", profile),
             "fiscal_year": fiscal_year,
         }
         
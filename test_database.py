@@ -23,5 +23,43 @@ items = db.get_items(category="Heavy Equipment", limit=3)
 for item in items:
     print(f"   {item['unique_id']}: {item['model']} - ${item['hammer']:,.2f}")
 
+# Test 4: Query builder (no database needed)
+print("\n4. Item query builder:")
+query, params = AuctionDatabase._build_items_query(categories=["Heavy Equipment"], limit=5)
+assert "category = %s" in query and "ANY" not in query
+assert params == ["Heavy Equipment", 5]
+query, params = AuctionDatabase._build_items_query(categories=["Heavy Equipment", "Trucks"], limit=5)
+assert "category = ANY(%s)" in query
+query, params = AuctionDatabase._build_items_query(
+    columns=["model"], after=("2025-01-01", "X1"), limit=5
+)
+assert "auctiondate IS NOT NULL" in query
+assert "DESC NULLS LAST" in query
+query, params = AuctionDatabase._build_items_query(categories=["Heavy Equipment"], dated_only=False)
+assert "auctiondate IS NOT NULL" not in query
+assert "(auctiondate, unique_id) < (%s, %s)" in query
+assert query.split("FROM")[0].split("SELECT")[1].strip() == "model, auctiondate, unique_id"
+assert params == ["2025-01-01", "X1", 5]
+try:
+    AuctionDatabase._build_items_query(columns=["password"])
+    raise AssertionError("unknown column accepted")
+except ValueError:
+    pass
+print("   ✓ Builder checks passed")
+
+# Test 5: Keyset pagination matches a single large page
+print("\n5. Keyset pagination:")
+expected, _ = db.query_items(categories=["Heavy Equipment"], columns=["model"], limit=9)
+paged, cursor = [], None
+for _ in range(3):
+    page, cursor = db.query_items(
+        categories=["Heavy Equipment"], columns=["model"], after=cursor, limit=3
+    )
+    paged.extend(page)
+    if cursor is None:
+        break
+assert [i["unique_id"] for i in paged] == [i["unique_id"] for i in expected]
+print(f"   ✓ {len(paged)} items across pages match one query")
+
 db.close()
 print("\n✓ Database connection working!")
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Checks for inference profiles (no database or LM needed)
+"""
+from src.analyzer import AuctionAnalyzer, INFERENCE_PROFILES
+from src.report_generator import ReportGenerator
+
+def predictor_layout(analyzer: AuctionAnalyzer) -> dict:
+    """Map predictor name -> max_tokens from its config"""
+    return {
+        name: predictor.config.get("max_tokens")
+        for name, predictor in analyzer.named_predictors()
+    }
+
+def main():
+    print("Testing inference profiles...")
+
+    # Test 1: Validation
+    print("\n1. Profile and stage validation:")
+    for kwargs in [
+        {"profile": "turbo"},
+        {"stage_profiles": {"analyze_category": "turbo"}},
+        {"stage_profiles": {"not_a_stage": "fast"}},
+        {"stage_profiles": {"analyze_category": "fast"}, "compiled_paths": {"thorough": "x.json"}},
+    ]:
+        try:
+            AuctionAnalyzer(None, **kwargs)
+            raise AssertionError(f"accepted {kwargs}")
+        except ValueError:
+            pass
+    print("   ✓ Invalid profiles, stages and compiled+override combinations rejected")
+
+    # Test 2: Predictor layout per profile
+    print("\n2. Predictor layout per profile:")
+    fast = predictor_layout(AuctionAnalyzer(None, profile="fast"))
+    assert fast["analyze_category"] == INFERENCE_PROFILES["fast"]["analyze_category"][1]
+    assert not any(name.endswith(".predict") for name in fast)
+
+    thorough = predictor_layout(AuctionAnalyzer(None, profile="thorough"))
+    assert set(thorough) == {f"{stage}.predict" for stage in INFERENCE_PROFILES["thorough"]}
+    assert all(max_tokens is None for max_tokens in thorough.values())
+
+    mixed = predictor_layout(AuctionAnalyzer(None, stage_profiles={"analyze_category": "fast"}))
+    assert "analyze_category" in mixed and "analyze_trends.predict" in mixed
+    print("   ✓ Predict stages are '<stage>', ChainOfThought stages '<stage>.predict'")
+
+    # Test 3: Report profile precedence
+    print("\n3. Report profile precedence:")
+    agent = AuctionAnalyzer(None)
+    reporter = ReportGenerator(agent, report_profiles={"category_auction_analysis": "fast"})
+    assert reporter._use_report_profile("category_auction_analysis") == "fast"
+    assert reporter._use_report_profile("weekly_trends_analysis") == "thorough"
+    assert reporter._use_report_profile("weekly_trends_analysis", "balanced") == "balanced"
+
+    agent = AuctionAnalyzer(None, profile="balanced", stage_profiles={"generate_report": "fast"})
+    reporter = ReportGenerator(agent, report_profiles={"category_auction_analysis": "fast"})
+    assert reporter._use_report_profile("category_auction_analysis") == "balanced"
+    assert reporter._use_report_profile("category_auction_analysis", "thorough") == "thorough"
+    assert agent.stage_profiles == {"generate_report": "fast"}
+    assert "generate_report" in predictor_layout(agent)
+    print("   ✓ Call > agent profile > report_profiles; stage overrides kept")
+
+    print("\n✓ Inference profile checks passed!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Checks for the shared-prefix prompt layout (no database or LM needed)
+"""
+import os
+import dspy
+from src.analyzer import AuctionAnalyzer, AnalyzeWeeklyTrends, IdentifyAnomalies, FY_CONTEXT_DESC
+from src.llm import SharedPrefixAdapter, SHARED_INSTRUCTIONS
+
+FY_CONTEXT = "Fiscal Year 2026 Summary:\nTotal Weeks: 20\nOverall Avg Lot Value: $12,345.00"
+
+def main():
+    print("Testing prompt layout...")
+    adapter = SharedPrefixAdapter()
+
+    trends = adapter.format(AnalyzeWeeklyTrends, [], {
+        "fy_context": FY_CONTEXT,
+        "trend_summary": "Lot Value Trend (linear fit): $+12.00/week",
+        "weekly_data": "Wk 1: $12,000 WoW n/a YoY +3.0% p50",
+    })
+    anomalies = adapter.format(IdentifyAnomalies, [], {
+        "fy_context": FY_CONTEXT,
+        "weekly_data": "Week 1: Avg Lot Value: $12,000, Items: 400, Revenue: $4,800,000",
+    })
+
+    # Test 1: Shared prefix runs through the end of fy_context
+    print("\n1. Shared prefix across weekly stages:")
+    shared_prefix = os.path.commonprefix([trends[0]["content"], anomalies[0]["content"]])
+    expected = f"{SHARED_INSTRUCTIONS}\n\n{FY_CONTEXT_DESC}:\n{FY_CONTEXT}"
+    assert shared_prefix.startswith(expected), shared_prefix
+    assert trends[0]["content"] != anomalies[0]["content"]
+    assert all(FY_CONTEXT not in m["content"] for m in trends[1:] + anomalies[1:])
+    print(f"   ✓ {len(shared_prefix)} shared characters, fy_context sent once in the prefix")
+
+    # Test 2: Demos from another fiscal year keep their own context
+    print("\n2. Demos with a different fy_context:")
+    demo = dspy.Example(
+        fy_context="Fiscal Year 2025 Summary:\nTotal Weeks: 52",
+        weekly_data="Week 1: Avg Lot Value: $11,000",
+        anomalies="None"
+    )
+    with_demo = adapter.format(IdentifyAnomalies, [demo], {
+        "fy_context": FY_CONTEXT,
+        "weekly_data": "Week 1: Avg Lot Value: $12,000",
+    })
+    assert not with_demo[0]["content"].startswith(SHARED_INSTRUCTIONS)
+    assert any("Fiscal Year 2025" in m["content"] for m in with_demo)
+    print("   ✓ Falls back to the plain ChatAdapter layout")
+
+    # Test 3: The analyzer applies the adapter itself
+    print("\n3. Analyzer adapter:")
+    assert isinstance(AuctionAnalyzer(None).adapter, SharedPrefixAdapter)
+    print("   ✓ AuctionAnalyzer uses SharedPrefixAdapter by default")
+
+    print("\n✓ Prompt layout checks passed!")
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,10 @@
-import dspy
+from src.llm import configure_lm
 from src.database import AuctionDatabase
 from src.analyzer import AuctionAnalyzer
 from src.report_generator import ReportGenerator
 
-# Configure DSPy
-ollama_model = dspy.LM(
-    model='ollama/llama3.1:8b',
-    api_base='http://localhost:11434',
-    api_key='ollama',
-    max_tokens=500
-)
-dspy.configure(lm=ollama_model)
+# Configure DSPy (shared LM with keep_alive)
+configure_lm(model='ollama/llama3.1:8b', max_tokens=500)
 
 # Create components
 db = AuctionDatabase()